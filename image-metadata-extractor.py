@@ -1,25 +1,78 @@
+import argparse
+import io
+import json
+import math
 import os
-import re
+import struct
+import zlib
 import requests
-from PIL import Image, ExifTags
-from io import BytesIO
-
-
-def get_image(file_path):
-    """
-    Retrieves an image from a local file path or a remote URL.
-    :param str file_path: The file path or URL of the image to retrieve.
-    :return: A PIL Image object representing the retrieved image.
-    :raises ValueError: If an error occurs while retrieving the image.
-    """
-    if re.match(r"^(http|https)://[a-zA-Z0-9\-.]+\.[a-zA-Z]{2,}(/\S*)?$", file_path):
-        print("Retrieving image from URL...")
-        return download_image(file_path)
-    else:
-        if os.path.exists(file_path):
-            return open_local_image(file_path)
-        else:
-            raise ValueError("File not found. Please check the file path and try again.")
+import urllib3
+from requests.adapters import HTTPAdapter
+from PIL import Image, UnidentifiedImageError
+from concurrent.futures import ThreadPoolExecutor
+
+# Inputs starting with one of these are downloaded; malformed URLs are reported by requests
+_URL_PREFIXES = ('http://', 'https://')
+
+# Tag ID of the pointer from IFD0 to the Exif sub-IFD holding the exposure tags
+_EXIF_IFD = 0x8769
+
+# IDs of the EXIF tags `extract_metadata` reads, as fixed by the TIFF/EXIF specification, mapped to their names
+_WANTED_TAGS = {
+    271: 'Make',
+    272: 'Model',
+    33434: 'ExposureTime',
+    33437: 'FNumber',
+    34855: 'ISOSpeedRatings',
+    37386: 'FocalLength',
+}
+
+# JPEG markers walked by `_fast_jpeg_exif`; 0xFFC4, 0xFFC8 and 0xFFCC share the start-of-frame range but are not frames
+_JPEG_SOI = b'\xff\xd8'
+_JPEG_APP1 = 0xFFE1
+_JPEG_SOS = 0xFFDA
+_JPEG_EOI = 0xFFD9
+_JPEG_SOF = frozenset(range(0xFFC0, 0xFFD0)) - {0xFFC4, 0xFFC8, 0xFFCC}
+
+# File signatures recognised by `_sniff`
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Keyword of the PNG text chunk in which ImageMagick and older tools store the EXIF block as hex, read by Pillow when
+# the file has no eXIf chunk
+_PNG_RAW_EXIF = 'Raw profile type exif'
+
+# Bytes read from the start of a local file by `get_file_metadata`, enough for the EXIF block and the image size of
+# most JPEG and PNG files; WebP files keep their EXIF chunk after the image data, so for those the walk usually
+# continues on the file
+_HEADER_BYTES = 65536
+
+# TIFF field types mapped to their struct format character and size in bytes; rationals are pairs of longs, and IFD
+# (13) is an offset some writers use for the Exif sub-IFD pointer
+_TIFF_TYPES = {
+    1: ('B', 1), 2: ('s', 1), 3: ('H', 2), 4: ('L', 4), 5: ('L', 8), 6: ('b', 1),
+    7: ('s', 1), 8: ('h', 2), 9: ('l', 4), 10: ('l', 8), 11: ('f', 4), 12: ('d', 8), 13: ('L', 4),
+}
+
+# Tags `_read_ifd` decodes: the wanted tags and the pointer to the Exif sub-IFD
+_IFD_TAGS = frozenset(_WANTED_TAGS) | {_EXIF_IFD}
+
+# Precompiled layout of a 12-byte IFD entry (tag, field type, value count, value or value offset) per byte order
+_IFD_ENTRY = {'<': struct.Struct('<HHL4s'), '>': struct.Struct('>HHL4s')}
+
+# Largest JPEG download whose rest `_get_remote_metadata` reads after the header, so that its connection goes back
+# to the pool of `_SESSION`; the connection of a larger download is closed instead of transferring its pixel data
+_DRAIN_BYTES = 1024 * 1024
+
+# Number of images `main` retrieves concurrently; file reads and downloads are I/O bound, so this exceeds the CPU count
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Shared session so downloads from the same host reuse keep-alive connections instead of a new TCP/TLS handshake
+# each, except JPEG downloads larger than `_DRAIN_BYTES`, which are cut short after their header; the pool is sized
+# for the `_MAX_WORKERS` threads of `main`
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=_MAX_WORKERS, max_retries=3)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
 
 
 def download_image(url):
@@ -30,106 +83,476 @@ def download_image(url):
     :raises ValueError: If an error occurs while downloading the image.
     """
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        img_data = response.content
-        return Image.open(BytesIO(img_data))
-    except requests.exceptions.RequestException as e:
+        return Image.open(_open_url(url))
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
         raise ValueError(f"Error downloading image: {e}")
+    except UnidentifiedImageError:
+        # Pillow names the file object in its message rather than the URL
+        raise ValueError(f"Not a supported image: {url}")
+    except OSError as e:
+        raise ValueError(f"Error opening image: {e}")
 
 
-def open_local_image(file_path):
+def _open_url(url):
     """
-    Opens an image file from the local file system and returns it as a PIL Image object.
+    Requests an image from a URL without reading its body, so that callers can stream it.
+    :param str url: The URL of the image to request.
+    :return: The urllib3 body stream of the response, decoding any content encoding.
+    :raises requests.exceptions.RequestException: If the request fails or returns an error status.
+    """
+    response = _SESSION.get(url, stream=True)
+    response.raise_for_status()
+    response.raw.decode_content = True
+    return response.raw
+
+
+def _open_file(file_path):
+    """
+    Opens a local file for binary reading.
     :param str file_path: The file path of the image to open.
-    :return: A PIL Image object representing the opened image.
-    :raises ValueError: If the file cannot be found or is not an image file.
+    :return: The opened binary file object.
+    :raises ValueError: If the file cannot be found or opened.
     """
     try:
-        return Image.open(file_path)
-    except (FileNotFoundError, IsADirectoryError) as e:
+        return open(file_path, 'rb')
+    except FileNotFoundError:
+        raise ValueError("File not found. Please check the file path and try again.")
+    except OSError as e:
         raise ValueError(f"Error opening image: {e}")
 
 
-def extract_metadata(exif_data, img):
+def _format_ratio(value):
+    """
+    Formats an EXIF rational, such as an f-stop or a focal length, as a decimal number.
+    :param value: The rational value, as a number.
+    :return str: The formatted value, or 'unknown' if the value is not a single, defined number.
     """
-    Extracts metadata from a PIL Image object using its EXIF data.
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 'unknown'
+    if math.isnan(number):
+        return 'unknown'
+    return str(number)
+
+
+def _format_exposure(value):
+    """
+    Formats an EXIF exposure time in seconds as a shutter speed, a fraction for exposures shorter than a second.
+    :param value: The exposure time, as a number.
+    :return str: The formatted shutter speed, or 'unknown' if the value is not a positive, finite number.
+    """
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return 'unknown'
+    if not 0 < seconds < math.inf:
+        return 'unknown'
+    if seconds >= 1:
+        return f"{seconds:g}"
+    return f"1/{round(1 / seconds)}"
+
+
+# EXIF tags reported by `extract_metadata`, as (EXIF tag name, metadata key, conversion) tuples
+_METADATA_TAGS = (
+    ('Make', 'Camera Make', str),
+    ('Model', 'Camera Model', str),
+    ('FNumber', 'F-stop', _format_ratio),
+    ('FocalLength', 'Focal Length', _format_ratio),
+    ('ExposureTime', 'Shutter Speed', _format_exposure),
+    ('ISOSpeedRatings', 'ISO', str),
+)
+
+# Metadata of an image without any of the EXIF tags, which also fixes the order of the keys
+_UNKNOWN_METADATA = {
+    'Camera Make': 'unknown',
+    'Camera Model': 'unknown',
+    'Image Width': 'unknown',
+    'Image Height': 'unknown',
+    'F-stop': 'unknown',
+    'Focal Length': 'unknown',
+    'Shutter Speed': 'unknown',
+    'ISO': 'unknown',
+}
+
+
+def extract_metadata(exif_data, size):
+    """
+    Extracts metadata from the EXIF data and size of an image.
     :param dict exif_data: A dictionary containing the EXIF data of the image.
+    :param tuple size: The width and height of the image.
+    :return dict: A dictionary containing the extracted metadata.
+    """
+    metadata = dict(_UNKNOWN_METADATA)
+
+    # Extract image size, kept as numbers and only formatted when printed
+    metadata['Image Width'], metadata['Image Height'] = size
+
+    # Extract camera make and model, f-stop, focal length, shutter speed and ISO
+    for exif_key, key, convert in _METADATA_TAGS:
+        value = exif_data.get(exif_key)
+        if value is not None:
+            metadata[key] = convert(value)
+
+    return metadata
+
+
+def get_metadata(img):
+    """
+    Retrieves metadata from a PIL Image object.
     :param Image img: A PIL Image object.
     :return dict: A dictionary containing the extracted metadata.
     """
-    metadata = {}
+    # Keep the merged tags on the image so repeated calls don't walk the IFDs again
+    tags = getattr(img, '_cached_exif', None)
+    if tags is None:
+        if img.format == 'PNG' and 'exif' not in img.info and _PNG_RAW_EXIF not in img.info:
+            # For PNG, getexif() decodes the whole image to look for an eXIf chunk after the pixel data; the chunk
+            # belongs before the pixel data, so without one or a raw profile in the header the image has no EXIF data
+            tags = {}
+        else:
+            # getexif() only parses the EXIF header block, it never decodes pixel data
+            exif = img.getexif()
+            tags = dict(exif)
+            tags.update(exif.get_ifd(_EXIF_IFD))
+        img._cached_exif = tags
 
-    # Extract camera make and model
-    if 'Make' in exif_data:
-        metadata['Camera Make'] = exif_data['Make']
-    else:
-        metadata['Camera Make'] = 'unknown'
+    return _metadata_from_tags(tags, img.size)
 
-    if 'Model' in exif_data:
-        metadata['Camera Model'] = exif_data['Model']
-    else:
-        metadata['Camera Model'] = 'unknown'
 
-    # Extract image size
-    if hasattr(img, 'size'):
-        width, height = img.size
-        metadata['Image Size'] = f"{width} x {height}"
-    else:
-        metadata['Image Size'] = 'unknown'
-
-    # Extract f-stop
-    if 'FNumber' in exif_data:
-        f_stop = exif_data['FNumber']
-        if isinstance(f_stop, tuple):
-            f_stop = f_stop[0] / f_stop[1]
-        metadata['F-stop'] = str(f_stop)
-    else:
-        metadata['F-stop'] = 'unknown'
-
-    # Extract focal length
-    if 'FocalLength' in exif_data:
-        focal_length = exif_data['FocalLength']
-        if isinstance(focal_length, tuple):
-            focal_length = focal_length[0] / focal_length[1]
-        metadata['Focal Length'] = str(focal_length)
-    else:
-        metadata['Focal Length'] = 'unknown'
+def _metadata_from_tags(tags, size):
+    """
+    Names the numeric EXIF tags of an image and extracts the metadata from them.
+    :param dict tags: A dictionary mapping EXIF tag IDs to their values.
+    :param tuple size: The width and height of the image.
+    :return dict: A dictionary containing the extracted metadata.
+    """
+    if not tags:
+        return {**_UNKNOWN_METADATA, 'Image Width': size[0], 'Image Height': size[1]}
+
+    # Bind the lookup to a local so the comprehension doesn't resolve the global on every tag
+    wanted = _WANTED_TAGS.get
+    exif_data = {name: value for tag, value in tags.items() if (name := wanted(tag)) is not None}
+
+    return extract_metadata(exif_data, size)
+
+
+def _read_ifd(data, byte_order, offset):
+    """
+    Reads the entries of one TIFF image file directory.
+    :param bytes data: The TIFF block, starting at its byte order mark.
+    :param str byte_order: The struct byte order of the block, '<' or '>'.
+    :param int offset: The offset of the directory within the block.
+    :return dict: A dictionary mapping the IDs of the wanted tags and of the Exif sub-IFD pointer to their values.
+        A truncated directory yields the entries read so far.
+    """
+    tags = {}
+    ifd_tags, field_types = _IFD_TAGS, _TIFF_TYPES
+    try:
+        count, = struct.unpack_from(byte_order + 'H', data, offset)
+        # Unpack the whole entry table in one pass, keeping only the complete entries of a truncated table
+        entries = data[offset + 2:offset + 2 + 12 * count]
+        entries = entries[:len(entries) - len(entries) % 12]
+        for tag, field_type, n, raw in _IFD_ENTRY[byte_order].iter_unpack(entries):
+            field = field_types.get(field_type)
+            if tag not in ifd_tags or field is None:
+                continue
+            char, size = field
+            if size * n > 4:
+                # Values that don't fit in the entry are stored elsewhere in the block
+                value_offset, = struct.unpack(byte_order + 'L', raw)
+                raw = data[value_offset:value_offset + size * n]
+
+            if char == 's':
+                value = raw[:n]
+                if field_type == 2:
+                    value = value.rstrip(b'\0').decode('latin-1')
+                tags[tag] = value
+                continue
+            if field_type in (5, 10):
+                parts = struct.unpack_from(f"{byte_order}{2 * n}{char}", raw)
+                values = tuple(num / den if den else float('nan') for num, den in zip(parts[::2], parts[1::2]))
+            else:
+                values = struct.unpack_from(f"{byte_order}{n}{char}", raw)
+            tags[tag] = values[0] if len(values) == 1 else values
+    except struct.error:
+        pass
+    return tags
+
+
+def _parse_tiff(data):
+    """
+    Reads the EXIF tags of a TIFF block, as embedded in JPEG, PNG and WebP files.
+    :param bytes data: The TIFF block, optionally preceded by the 'Exif\\0\\0' identifier.
+    :return dict: A dictionary mapping the IDs of the wanted tags found in IFD0 and the Exif sub-IFD to their values.
+    """
+    if data[:6] == b'Exif\0\0':
+        data = data[6:]
+    byte_order = {b'II': '<', b'MM': '>'}.get(data[:2])
+    if byte_order is None or len(data) < 8:
+        return {}
+
+    ifd_offset, = struct.unpack_from(byte_order + 'L', data, 4)
+    tags = _read_ifd(data, byte_order, ifd_offset)
+    if isinstance(tags.get(_EXIF_IFD), int):
+        tags.update(_read_ifd(data, byte_order, tags[_EXIF_IFD]))
+    return tags
+
+
+def _fast_jpeg_exif(fp):
+    """
+    Reads the EXIF tags and size of a JPEG image by walking its marker segments, without going through Pillow.
+    Only the APP1 segment is read; the bodies of all other segments are skipped, and the walk stops at the frame header.
+    :param fp: A binary file object positioned just after the SOI marker of the image. It does not need to be
+        seekable, so a download can be walked as it streams in.
+    :return: A tuple of a dictionary mapping EXIF tag IDs to their values and the width and height of the image,
+        or None if the header could not be walked, in which case the caller should fall back to Pillow.
+    """
+    tags = {}
+    seekable = fp.seekable()
+    while True:
+        header = fp.read(4)
+        if len(header) < 4:
+            return None
+        marker, length = struct.unpack('>HH', header)
+        if marker in _JPEG_SOF:
+            frame = fp.read(5)
+            if len(frame) < 5:
+                return None
+            _, height, width = struct.unpack('>BHH', frame)
+            return tags, (width, height)
+        if marker >> 8 != 0xFF or marker in (_JPEG_SOS, _JPEG_EOI) or length < 2:
+            return None
+
+        if marker == _JPEG_APP1 and not tags:
+            segment = fp.read(length - 2)
+            if segment[:6] == b'Exif\0\0':
+                tags = _parse_tiff(segment)
+        elif seekable:
+            fp.seek(length - 2, 1)
+        else:
+            fp.read(length - 2)
+
 
-    # Extract shutter speed
-    if 'ExposureTime' in exif_data:
-        exposure_time = exif_data['ExposureTime']
-        if isinstance(exposure_time, tuple):
-            exposure_time = f"{exposure_time[1]}/{exposure_time[0]}"
+def _png_header(fp):
+    """
+    Reads the EXIF tags and size of a PNG image from the IHDR and eXIf chunks, or from a tEXt or zTXt chunk holding
+    the EXIF block as a raw profile, seeking past all other chunks.
+    :param fp: A seekable binary file object positioned just after the PNG signature.
+    :return: A tuple of a dictionary mapping EXIF tag IDs to their values and the width and height of the image,
+        or None if the chunks before the image data could not be read.
+    """
+    raw_keyword = _PNG_RAW_EXIF.encode('latin-1') + b'\0'
+    exif = raw_profile = size = None
+    while True:
+        chunk = fp.read(8)
+        if len(chunk) < 8:
+            return None
+        length, chunk_type = struct.unpack('>L4s', chunk)
+        if chunk_type == b'IDAT':
+            # The EXIF data must precede the image data, so there is nothing left to look for
+            if size is None:
+                return None
+            if exif is None and raw_profile is not None:
+                # Like Pillow, skip the profile name and length lines and join the hex lines that follow
+                try:
+                    exif = bytes.fromhex(''.join(raw_profile.split('\n')[3:]))
+                except ValueError:
+                    return None
+            return (_parse_tiff(exif) if exif is not None else {}), size
+
+        if chunk_type in (b'tEXt', b'zTXt', b'iTXt'):
+            # Other text chunks, such as XMP, are skipped once their keyword has been read
+            keyword = fp.read(min(length, len(raw_keyword)))
+            if keyword != raw_keyword:
+                fp.seek(length - len(keyword) + 4, 1)
+                continue
+            if chunk_type == b'iTXt':
+                # Rare enough to leave its compression and encoding flags to Pillow
+                return None
+            length -= len(keyword)
+
+        if chunk_type in (b'IHDR', b'eXIf', b'tEXt', b'zTXt'):
+            data = fp.read(length)
+            if len(data) < length:
+                return None
+            if chunk_type == b'eXIf':
+                exif = data
+            elif chunk_type == b'IHDR':
+                if length >= 8:
+                    size = struct.unpack_from('>LL', data)
+            else:
+                if chunk_type == b'zTXt':
+                    if data[:1] != b'\0':
+                        return None
+                    try:
+                        data = zlib.decompress(data[1:])
+                    except zlib.error:
+                        return None
+                raw_profile = data.decode('latin-1')
+            fp.seek(4, 1)
         else:
-            exposure_time = f"1/{str(round(1 / exposure_time))}"
-        metadata['Shutter Speed'] = exposure_time
-    else:
-        metadata['Shutter Speed'] = 'unknown'
+            fp.seek(length + 4, 1)
 
-    # Extract ISO
-    if 'ISOSpeedRatings' in exif_data:
-        metadata['ISO'] = str(exif_data['ISOSpeedRatings'])
-    else:
-        metadata['ISO'] = 'unknown'
 
-    return metadata
+def _webp_header(fp):
+    """
+    Reads the EXIF tags and size of a WebP image from its chunks, seeking past the image bitstream.
+    :param fp: A seekable binary file object positioned just after the RIFF header.
+    :return: A tuple of a dictionary mapping EXIF tag IDs to their values and the width and height of the image,
+        or None if the chunks could not be read.
+    """
+    size = None
+    while True:
+        chunk = fp.read(8)
+        if len(chunk) < 8:
+            return None
+        fourcc, length = struct.unpack('<4sL', chunk)
+        if fourcc != b'EXIF' and (size is not None or fourcc not in (b'VP8X', b'VP8 ', b'VP8L')):
+            # Chunks are padded to an even length
+            fp.seek(length + (length & 1), 1)
+            continue
+
+        # Only the first bytes of a bitstream chunk are needed for the size
+        wanted = length if fourcc == b'EXIF' else min(length, 10)
+        data = fp.read(wanted)
+        if len(data) < wanted:
+            return None
+        if fourcc == b'EXIF':
+            return (_parse_tiff(data), size) if size is not None else None
+        if fourcc == b'VP8X' and length >= 10:
+            # Extended format: the canvas size is stored minus one, and a flag tells whether an EXIF chunk follows
+            size = (int.from_bytes(data[4:7], 'little') + 1, int.from_bytes(data[7:10], 'little') + 1)
+            if not data[0] & 0x08:
+                return {}, size
+        elif fourcc == b'VP8 ' and length >= 10:
+            # Simple lossy format, which has no room for EXIF data
+            width, height = struct.unpack_from('<HH', data, 6)
+            return {}, (width & 0x3FFF, height & 0x3FFF)
+        elif fourcc == b'VP8L' and length >= 5:
+            # Simple lossless format, which has no room for EXIF data
+            bits = int.from_bytes(data[1:5], 'little')
+            return {}, ((bits & 0x3FFF) + 1, (bits >> 14 & 0x3FFF) + 1)
+        fp.seek(length - wanted + (length & 1), 1)
+
+
+def _sniff(head):
+    """
+    Identifies the format of an image from its signature.
+    :param bytes head: The first bytes of the file.
+    :return str: The Pillow name of the format, 'JPEG', 'PNG' or 'WEBP', or None if it is not one of those.
+    """
+    if head[:2] == _JPEG_SOI:
+        return 'JPEG'
+    if head[:8] == _PNG_SIGNATURE:
+        return 'PNG'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'WEBP'
+    return None
 
 
-def get_metadata(img):
+# Header parser of each format returned by `_sniff`, with the offset at which it starts reading
+_HEADER_PARSERS = {
+    'JPEG': (len(_JPEG_SOI), _fast_jpeg_exif),
+    'PNG': (len(_PNG_SIGNATURE), _png_header),
+    'WEBP': (12, _webp_header),
+}
+
+
+def _read_meta(head):
     """
-    Retrieves metadata from a PIL Image object.
-    :param Image img: A PIL Image object.
+    Reads the EXIF tags and size of an image from the first bytes of its file, without going through Pillow.
+    :param bytes head: The first bytes of the file.
+    :return: A tuple of the format returned by `_sniff`, and of a tuple of a dictionary mapping EXIF tag IDs to their
+        values and the width and height of the image, or None if they could not be read from `head`.
+    """
+    fmt = _sniff(head)
+    if fmt is None:
+        return None, None
+    start, parse = _HEADER_PARSERS[fmt]
+    stream = io.BytesIO(head)
+    stream.seek(start)
+    return fmt, parse(stream)
+
+
+def _read_file_header(fp):
+    """
+    Reads the EXIF tags and size of an image from an open file with `_read_meta`. One read feeds both the format
+    sniff and the header parse, and the file itself is walked only when the header continues beyond the bytes read.
+    :param fp: The image file, opened in binary mode and positioned at its start.
+    :return: A tuple of a dictionary mapping EXIF tag IDs to their values and the width and height of the image, or
+        None if the image has to be read with Pillow.
+    """
+    head = fp.read(_HEADER_BYTES)
+    fmt, header = _read_meta(head)
+    if header is None and fmt is not None and len(head) == _HEADER_BYTES:
+        start, parse = _HEADER_PARSERS[fmt]
+        fp.seek(start)
+        header = parse(fp)
+    return header
+
+
+def get_file_metadata(file_path):
+    """
+    Retrieves metadata from an image file path or URL. Local JPEG, PNG and WebP files are read with
+    `_read_file_header`, and remote JPEG images with `_fast_jpeg_exif`, which only reads the header segments; other
+    images are opened with Pillow from the same file handle or download stream and passed to `get_metadata`.
+    :param str file_path: The file path or URL of the image.
     :return dict: A dictionary containing the extracted metadata.
+    :raises ValueError: If an error occurs while retrieving the image.
     """
-    exif_data = {}
-    exif = img._getexif()
-    if exif:
-        for tag, value in exif.items():
-            if tag in ExifTags.TAGS:
-                exif_data[ExifTags.TAGS[tag]] = value
+    if file_path.startswith(_URL_PREFIXES):
+        print("Retrieving image from URL...")
+        return _get_remote_metadata(file_path)
+
+    with _open_file(file_path) as fp:
+        try:
+            header = _read_file_header(fp)
+            if header is not None:
+                return _metadata_from_tags(*header)
 
-    return extract_metadata(exif_data, img)
+            # Let Pillow read the handle that is already open rather than opening the file again
+            fp.seek(0)
+            return get_metadata(Image.open(fp))
+        except UnidentifiedImageError:
+            raise ValueError(f"Not a supported image: {file_path}")
+        except OSError as e:
+            raise ValueError(f"Error opening image: {e}")
+
+
+def _get_remote_metadata(url):
+    """
+    Retrieves metadata from an image URL, streaming the download. For a JPEG image larger than `_DRAIN_BYTES` the
+    connection is closed once `_fast_jpeg_exif` has read the header, so the compressed pixel data is never
+    downloaded; smaller ones are read to the end so that their keep-alive connection can be reused.
+    :param str url: The URL of the image.
+    :return dict: A dictionary containing the extracted metadata.
+    :raises ValueError: If an error occurs while downloading the image.
+    """
+    try:
+        body = _open_url(url)
+        with io.BufferedReader(body) as stream:
+            # Peek rather than read, so that Pillow still gets other formats from their first byte
+            if stream.peek(2)[:2] != _JPEG_SOI:
+                return get_metadata(Image.open(stream))
+            stream.read(2)
+            header = _fast_jpeg_exif(stream)
+            if header is not None:
+                length = body.headers.get('Content-Length', '')
+                if length.isdigit() and int(length) <= _DRAIN_BYTES:
+                    # urllib3 closes the body as soon as it reaches the end
+                    while not stream.closed and stream.read(io.DEFAULT_BUFFER_SIZE):
+                        pass
+                return _metadata_from_tags(*header)
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        raise ValueError(f"Error downloading image: {e}")
+    except UnidentifiedImageError:
+        raise ValueError(f"Not a supported image: {url}")
+    except OSError as e:
+        raise ValueError(f"Error opening image: {e}")
+
+    # The stream can't be rewound, so a JPEG header the fast path couldn't walk is downloaded again for Pillow
+    return get_metadata(download_image(url))
 
 
 def print_metadata(metadata):
@@ -138,7 +561,10 @@ def print_metadata(metadata):
         :param dict metadata: A dictionary containing the metadata to be printed.
     """
     for key, value in metadata.items():
-        print(f"{key}: {value}")
+        if key == 'Image Width':
+            print(f"Image Size: {value} x {metadata['Image Height']}")
+        elif key != 'Image Height':
+            print(f"{key}: {value}")
 
 
 def export_metadata(metadata):
@@ -146,8 +572,6 @@ def export_metadata(metadata):
     Exports the metadata as a JSON file.
     :param dict metadata: A dictionary containing the metadata to be exported.
     """
-    import json
-
     with open('metadata.json', 'w') as outfile:
         json.dump(metadata, outfile, indent=4)
     print("Metadata exported as JSON to metadata.json")
@@ -158,32 +582,57 @@ def parse_args():
     Parses command-line arguments passed to the script using the argparse module.
     :return: An argparse Namespace object containing the parsed arguments.
     """
-    import argparse
-
-    parser = argparse.ArgumentParser(description='Extract metadata from an image file.')
-    parser.add_argument('file_path', help='Path to the image file (local file path or URL)')
+    parser = argparse.ArgumentParser(description='Extract metadata from one or more image files.')
+    parser.add_argument('file_paths', nargs='+', help='Paths to the image files (local file paths or URLs)')
     parser.add_argument('-j', '--json', action='store_true', help='Export metadata as JSON')
     return parser.parse_args()
 
 
+def _process_one(file_path):
+    """
+    Retrieves the metadata of one image for `main`, catching the error so that one bad file doesn't stop a batch.
+    :param str file_path: The file path or URL of the image.
+    :return: A tuple of the metadata dictionary and None, or of None and the error message.
+    """
+    try:
+        return get_file_metadata(file_path), None
+    except ValueError as e:
+        return None, str(e)
+
+
 def main():
     """
-    The main entry point of the program. Retrieves the file path or URL of the image to extract metadata from,
-    calls `get_image` to retrieve the image, extracts the metadata from the image using `get_metadata`,
-    and prints the metadata to the console using `print_metadata`.
+    The main entry point of the program. Retrieves the file paths or URLs of the images to extract metadata from,
+    extracts the metadata of all images concurrently using `_process_one`, and prints the metadata to the console
+    using `print_metadata`.
     """
     args = parse_args()
-    file_path = args.file_path
+    file_paths = args.file_paths
+    batch = len(file_paths) > 1
 
-    try:
-        image = get_image(file_path)
-        metadata = get_metadata(image)
-        if args.json:
-            export_metadata(metadata)
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        outcomes = list(executor.map(_process_one, file_paths))
+
+    results = {}
+    for file_path, (metadata, error) in zip(file_paths, outcomes):
+        if error is not None:
+            print(f"Error: {file_path}: {error}" if batch else f"Error: {error}")
         else:
+            results[file_path] = metadata
+
+    if not results:
+        return
+    if not batch:
+        results = results[file_paths[0]]
+
+    if args.json:
+        export_metadata(results)
+    elif not batch:
+        print_metadata(results)
+    else:
+        for file_path, metadata in results.items():
+            print(f"\n{file_path}")
             print_metadata(metadata)
-    except ValueError as e:
-        print(f"Error: {e}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,268 @@
+import functools
+import http.server
+import importlib.util
+import io
+import math
+import os
+import struct
+import tempfile
+import threading
+import unittest
+
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+# The script's file name isn't a valid module name, so load it by path
+_SPEC = importlib.util.spec_from_file_location(
+    'image_metadata_extractor', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'image-metadata-extractor.py'))
+extractor = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(extractor)
+
+
+def make_tiff(byte_order, pointer_type=4):
+    """
+    Builds an EXIF block with the tags the extractor reads, split over IFD0 and the Exif sub-IFD.
+    :param str byte_order: The struct byte order of the block, '<' or '>'.
+    :param int pointer_type: The TIFF field type of the Exif sub-IFD pointer, LONG (4) or IFD (13).
+    :return bytes: The EXIF block, including the 'Exif\\0\\0' identifier.
+    """
+    make, model = b'Canon\0', b'EOS R5\0'
+    ifd0_size = 2 + 12 * 3 + 4
+    make_offset = 8 + ifd0_size
+    model_offset = make_offset + len(make)
+    exif_offset = model_offset + len(model)
+    exif_size = 2 + 12 * 4 + 4
+    values_offset = exif_offset + exif_size
+
+    def entry(tag, field_type, count, value):
+        return struct.pack(byte_order + 'HHL', tag, field_type, count) + value
+
+    def long(value):
+        return struct.pack(byte_order + 'L', value)
+
+    data = (b'II' if byte_order == '<' else b'MM') + struct.pack(byte_order + 'HL', 42, 8)
+    data += struct.pack(byte_order + 'H', 3)
+    data += entry(271, 2, len(make), long(make_offset))
+    data += entry(272, 2, len(model), long(model_offset))
+    data += entry(0x8769, pointer_type, 1, long(exif_offset))
+    data += long(0) + make + model
+    data += struct.pack(byte_order + 'H', 4)
+    data += entry(33434, 5, 1, long(values_offset))
+    data += entry(33437, 5, 1, long(values_offset + 8))
+    data += entry(34855, 3, 1, struct.pack(byte_order + 'HH', 400, 0))
+    data += entry(37386, 5, 1, long(values_offset + 16))
+    data += long(0)
+    data += struct.pack(byte_order + '6L', 1, 250, 28, 10, 50, 1)
+    return b'Exif\0\0' + data
+
+
+def raw_profile(exif, compress=False):
+    """
+    Stores an EXIF block in a PNG text chunk as a hex raw profile, laid out the way ImageMagick writes it.
+    :param bytes exif: The EXIF block.
+    :param bool compress: Whether to write a zTXt chunk rather than a tEXt chunk.
+    :return PngInfo: The PNG text chunks, with a comment ahead of the profile.
+    """
+    hex_data = exif.hex()
+    lines = [hex_data[i:i + 72] for i in range(0, len(hex_data), 72)]
+    info = PngInfo()
+    info.add_text('Comment', 'not the profile')
+    info.add_text('Raw profile type exif', f"\nexif\n{len(exif):8d}\n" + '\n'.join(lines) + '\n', zip=compress)
+    return info
+
+
+def pillow_header(path):
+    """
+    Reads the wanted EXIF tags and the size of an image through Pillow, for comparison.
+    :param str path: The file path of the image.
+    :return: A tuple of a dictionary mapping EXIF tag IDs to their values and the width and height of the image.
+    """
+    with Image.open(path) as img:
+        exif = img.getexif()
+        tags = dict(exif)
+        tags.update(exif.get_ifd(extractor._EXIF_IFD))
+        tags = {tag: value for tag, value in tags.items() if tag in extractor._WANTED_TAGS}
+        # Pillow returns IFDRational objects where the parsers return floats
+        tags = {tag: float(value) if type(value).__name__ == 'IFDRational' else value for tag, value in tags.items()}
+        return tags, img.size
+
+
+class HeaderParserTest(unittest.TestCase):
+    """
+    Checks that the hand-written JPEG, PNG and WebP header parsers agree with Pillow.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        small = Image.new('RGB', (120, 80), 'red')
+        # Noise doesn't compress, so it pushes the image data past the header bytes
+        large = Image.effect_noise((600, 600), 80).convert('RGB')
+        little, big = make_tiff('<'), make_tiff('>')
+        cls.images = {
+            'jpeg_ii.jpg': (small, {'exif': little}),
+            'jpeg_mm.jpg': (small, {'exif': big}),
+            'jpeg_ifd_pointer.jpg': (small, {'exif': make_tiff('<', pointer_type=13)}),
+            'jpeg_plain.jpg': (small, {}),
+            'jpeg_sof_past_header.jpg': (small, {'exif': little, 'icc_profile': b'\0' * 100000}),
+            'png_exif.png': (small, {'exif': big}),
+            'png_plain.png': (small, {}),
+            'png_large_idat.png': (large, {'exif': little}),
+            'png_raw_profile.png': (small, {'pnginfo': raw_profile(big)}),
+            'png_raw_profile_ztxt.png': (small, {'pnginfo': raw_profile(little, compress=True)}),
+            'webp_lossy.webp': (small, {'quality': 80}),
+            'webp_lossless.webp': (small, {'lossless': True}),
+            'webp_vp8x.webp': (small, {'exif': little}),
+            'webp_vp8x_large.webp': (large, {'exif': big, 'quality': 95}),
+        }
+        for name, (img, params) in cls.images.items():
+            img.save(os.path.join(cls.tmp.name, name), **params)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_parsers_match_pillow(self):
+        for name in self.images:
+            with self.subTest(name):
+                path = os.path.join(self.tmp.name, name)
+                with open(path, 'rb') as fp:
+                    header = extractor._read_file_header(fp)
+                self.assertIsNotNone(header, 'fell back to Pillow')
+                tags, size = header
+                tags = {tag: value for tag, value in tags.items() if tag in extractor._WANTED_TAGS}
+                self.assertEqual((tags, size), pillow_header(path))
+
+    def test_file_metadata_matches_pillow(self):
+        for name in self.images:
+            with self.subTest(name):
+                path = os.path.join(self.tmp.name, name)
+                with Image.open(path) as img:
+                    self.assertEqual(extractor.get_file_metadata(path), extractor.get_metadata(img))
+
+    def test_exif_values(self):
+        metadata = extractor.get_file_metadata(os.path.join(self.tmp.name, 'jpeg_mm.jpg'))
+        self.assertEqual(metadata, {
+            'Camera Make': 'Canon',
+            'Camera Model': 'EOS R5',
+            'Image Width': 120,
+            'Image Height': 80,
+            'F-stop': '2.8',
+            'Focal Length': '50.0',
+            'Shutter Speed': '1/250',
+            'ISO': '400',
+        })
+
+    def test_png_raw_profile(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (120, 80), 'red').save(buffer, 'PNG', pnginfo=raw_profile(make_tiff('>')))
+        with Image.open(buffer) as img:
+            metadata = extractor.get_metadata(img)
+        self.assertEqual(metadata['Camera Model'], 'EOS R5')
+        self.assertEqual(metadata['Shutter Speed'], '1/250')
+        self.assertEqual(metadata['ISO'], '400')
+
+    def test_unsupported_file(self):
+        path = os.path.join(self.tmp.name, 'notes.txt')
+        with open(path, 'w') as fp:
+            fp.write('not an image')
+        with self.assertRaisesRegex(ValueError, '^Not a supported image: .*notes.txt$'):
+            extractor.get_file_metadata(path)
+
+    def test_truncated_headers_do_not_raise(self):
+        for name in ('jpeg_ii.jpg', 'png_exif.png', 'webp_vp8x.webp'):
+            with open(os.path.join(self.tmp.name, name), 'rb') as fp:
+                data = fp.read(2000)
+            for end in range(len(data)):
+                extractor._read_meta(data[:end])
+
+    def test_degenerate_exposure(self):
+        self.assertEqual(extractor._format_exposure(0.0), 'unknown')
+        self.assertEqual(extractor._format_exposure(math.nan), 'unknown')
+        self.assertEqual(extractor._format_exposure(1 / 250), '1/250')
+        self.assertEqual(extractor._format_exposure(1.0), '1')
+        self.assertEqual(extractor._format_exposure(1.5), '1.5')
+        self.assertEqual(extractor._format_exposure(30.0), '30')
+        self.assertEqual(extractor._format_ratio((1.0, 2.0)), 'unknown')
+
+
+
+class RemoteMetadataTest(unittest.TestCase):
+    """
+    Checks the streamed download path against a local HTTP server that counts its connections and requests.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        # Noise keeps the pixel data well past the first read of the stream, so the body isn't consumed by accident
+        noise = Image.effect_noise((300, 300), 80).convert('RGB')
+        for name, params in (('a.jpg', {'exif': make_tiff('<')}), ('b.jpg', {'exif': make_tiff('>')}),
+                             ('c.jpg', {}), ('d.png', {'exif': make_tiff('>')}),
+                             ('e.webp', {'exif': make_tiff('<')})):
+            noise.save(os.path.join(cls.tmp.name, name), **params)
+        with open(os.path.join(cls.tmp.name, 'broken.jpg'), 'wb') as fp:
+            fp.write(extractor._JPEG_SOI + b'not a jpeg' * 100)
+
+        cls.connections = []
+        cls.requests = []
+
+        class Handler(http.server.SimpleHTTPRequestHandler):
+            # HTTP/1.1 keeps the connection open between requests
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                cls.connections.append(self.client_address)
+
+            def do_GET(self):
+                cls.requests.append(self.path)
+                super().do_GET()
+
+            def log_message(self, format, *args):
+                pass
+
+        cls.server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), functools.partial(Handler, directory=cls.tmp.name))
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        extractor._ADAPTER.close()
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        # Start each test without pooled connections from the ones before it
+        extractor._ADAPTER.close()
+        del self.connections[:], self.requests[:]
+
+    def test_small_jpegs_reuse_connection(self):
+        for name in ('a.jpg', 'b.jpg', 'c.jpg', 'a.jpg'):
+            with self.subTest(name), Image.open(os.path.join(self.tmp.name, name)) as img:
+                self.assertEqual(extractor._get_remote_metadata(self.base_url + name), extractor.get_metadata(img))
+        self.assertEqual(len(self.requests), 4)
+        self.assertEqual(len(self.connections), 1)
+
+    def test_other_formats_match_pillow(self):
+        for name in ('d.png', 'e.webp'):
+            with self.subTest(name), Image.open(os.path.join(self.tmp.name, name)) as img:
+                self.assertEqual(extractor._get_remote_metadata(self.base_url + name), extractor.get_metadata(img))
+        self.assertEqual(len(self.requests), 2)
+
+    def test_missing_image(self):
+        with self.assertRaisesRegex(ValueError, '^Error downloading image: 404'):
+            extractor._get_remote_metadata(self.base_url + 'missing.jpg')
+
+    def test_unreadable_jpeg_is_downloaded_again(self):
+        with self.assertRaisesRegex(ValueError, '^Not a supported image: '):
+            extractor._get_remote_metadata(self.base_url + 'broken.jpg')
+        self.assertEqual(self.requests, ['/broken.jpg', '/broken.jpg'])
+
+
+if __name__ == '__main__':
+    unittest.main()